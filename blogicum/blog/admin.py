@@ -1,7 +1,39 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
 from django.contrib.auth.models import Group
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Concat, Length, Substr
 
-from .models import Category, Comment, Location, Post
+from .cache import invalidate_posts_cache
+from .models import MAX_ADMIN_FIELD_LENGHT, Category, Comment, Location, Post
+
+ADMIN_LIST_PER_PAGE: int = 50
+
+
+class OnlyFieldsChangeList(ChangeList):
+    def get_queryset(self, request, exclude_parameters=None):
+        return (
+            super().get_queryset(request, exclude_parameters)
+            .only(*self.model_admin.changelist_fields)
+        )
+
+
+class PostChangeList(OnlyFieldsChangeList):
+    def get_queryset(self, request, exclude_parameters=None):
+        return (
+            super().get_queryset(request, exclude_parameters)
+            .alias(title_length=Length('title'))
+            .annotate(short_title=Case(
+                When(
+                    title_length__gt=MAX_ADMIN_FIELD_LENGHT,
+                    then=Concat(
+                        Substr('title', 1, MAX_ADMIN_FIELD_LENGHT - 3),
+                        Value('...')
+                    )
+                ),
+                default=F('title')
+            ))
+        )
 
 
 class PostInline(admin.TabularInline):
@@ -49,7 +81,7 @@ class LocationAdmin(admin.ModelAdmin):
 @admin.register(Post)
 class PostAdmin(admin.ModelAdmin):
     list_display = (
-        'title',
+        'short_title',
         'pub_date',
         'author',
         'location',
@@ -67,6 +99,34 @@ class PostAdmin(admin.ModelAdmin):
         'category',
         'author'
     )
+    list_select_related = (
+        'author',
+        'category',
+        'location'
+    )
+    autocomplete_fields = (
+        'author',
+        'category',
+        'location'
+    )
+    list_per_page = ADMIN_LIST_PER_PAGE
+    show_full_result_count = False
+    changelist_fields = (
+        'title',
+        'pub_date',
+        'author__username',
+        'category__title',
+        'location__name',
+        'is_published',
+        'created_at'
+    )
+
+    def get_changelist(self, request, **kwargs):
+        return PostChangeList
+
+    @admin.display(description='Заголовок', ordering='title')
+    def short_title(self, obj):
+        return obj.short_title
 
 
 @admin.register(Comment)
@@ -81,6 +141,33 @@ class CommentAdmin(admin.ModelAdmin):
         'text',
     )
     search_fields = ('text',)
+    list_select_related = (
+        'author',
+        'post'
+    )
+    autocomplete_fields = (
+        'author',
+        'post'
+    )
+    list_per_page = ADMIN_LIST_PER_PAGE
+    show_full_result_count = False
+    changelist_fields = (
+        'text',
+        'created_at',
+        'author__username',
+        'post__title'
+    )
+
+    def get_changelist(self, request, **kwargs):
+        return OnlyFieldsChangeList
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        invalidate_posts_cache()
+
+    def delete_queryset(self, request, queryset):
+        super().delete_queryset(request, queryset)
+        invalidate_posts_cache()
 
 
 admin.site.unregister(Group)
@@ -0,0 +1,76 @@
+from functools import wraps
+from hashlib import md5
+from http import HTTPStatus
+from time import time, time_ns
+
+from django.core.cache import cache
+from django.http import HttpResponse
+
+POSTS_CACHE_TIMEOUT: int = 60
+POSTS_CACHE_VERSION_KEY: str = 'blog:posts:version'
+
+
+def get_posts_cache_version() -> int:
+    """Возвращает текущую версию кеша ленты публикаций.
+
+    Пропавшая версия начинается с текущего времени, а не с единицы,
+    чтобы не совпасть с одной из прежних версий.
+    """
+    return cache.get_or_set(POSTS_CACHE_VERSION_KEY, time_ns, None)
+
+
+def make_posts_cache_key(*parts) -> str:
+    """Собирает ключ кеша, привязанный к текущей версии ленты."""
+    digest = md5(':'.join(str(part) for part in parts).encode()).hexdigest()
+    return f'blog:posts:{get_posts_cache_version()}:{digest}'
+
+
+def invalidate_posts_cache() -> None:
+    """Сбрасывает кеш ленты, увеличивая её версию."""
+    try:
+        cache.incr(POSTS_CACHE_VERSION_KEY)
+    except ValueError:
+        cache.set(POSTS_CACHE_VERSION_KEY, time_ns(), None)
+
+
+def cache_page_for_anonymous(view):
+    """Кеширует HTML страницы ленты для неавторизованных посетителей."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return view(request, *args, **kwargs)
+        cache_key = make_posts_cache_key(
+            'html',
+            view.__name__,
+            *kwargs.values(),
+            request.GET.get('cursor')
+        )
+        content = cache.get(cache_key)
+        if content is not None:
+            return HttpResponse(content)
+        response = view(request, *args, **kwargs)
+        if response.status_code == HTTPStatus.OK:
+            def store(response):
+                cache.set(cache_key, response.content, POSTS_CACHE_TIMEOUT)
+            if getattr(response, 'is_rendered', True):
+                store(response)
+            else:
+                response.add_post_render_callback(store)
+        return response
+    return wrapper
+
+
+def posts_etag(request, *args, **kwargs) -> str:
+    """Возвращает ETag ленты: версия кеша, адрес, зритель и окно времени.
+
+    Окно времени нужно, чтобы отложенные публикации появлялись без
+    изменения версии кеша.
+    """
+    return make_posts_cache_key(
+        'etag',
+        request.resolver_match.view_name,
+        *kwargs.values(),
+        request.GET.get('cursor'),
+        request.user.pk,
+        int(time() // POSTS_CACHE_TIMEOUT)
+    )
@@ -7,6 +7,7 @@ class PublishedPostManager(Manager):
     def get_queryset(self):
         return (
             PostQuerySet(self.model)
-            .with_related_data()
+            .with_related_list_fields()
             .published()
+            .with_comment_count()
         )
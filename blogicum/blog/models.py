@@ -99,10 +99,40 @@ class Post(PostInformationModel):
         verbose_name_plural = 'Публикации'
         default_related_name = 'posts'
         ordering = ('-pub_date', 'title')
+        indexes = (
+            models.Index(
+                fields=('-pub_date',),
+                condition=models.Q(is_published=True),
+                name='post_pub_partial_idx'
+            ),
+            models.Index(
+                fields=('author', 'pub_date'),
+                name='post_author_idx'
+            ),
+            models.Index(
+                fields=('category', 'pub_date'),
+                name='post_category_idx'
+            ),
+        )
 
     def __str__(self):
         return convert_long_string(self.title)
 
+    @classmethod
+    def published_for_category(cls, category):
+        """Опубликованные посты заведомо опубликованной категории."""
+        return (
+            category.posts
+            .select_related('author', 'location')
+            .list_fields(
+                'author__username',
+                'location__name',
+                'location__is_published'
+            )
+            .published_for_known_category()
+            .with_comment_count()
+        )
+
 
 class Comment(CreatedFieldModel):
     text = models.TextField('Текст комментария')
@@ -122,6 +152,12 @@ class Comment(CreatedFieldModel):
         verbose_name_plural = 'Комментарии'
         default_related_name = 'comments'
         ordering = ('created_at',)
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at'),
+                name='comment_post_created_idx'
+            ),
+        )
 
     def __str__(self):
-        return convert_long_string(self.title)
+        return convert_long_string(self.text)
@@ -0,0 +1,150 @@
+import binascii
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime, timezone
+from hashlib import md5
+
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+from .cache import POSTS_CACHE_TIMEOUT, make_posts_cache_key
+
+NEXT: str = 'next'
+PREVIOUS: str = 'prev'
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator, который берёт COUNT(*) из кеша ленты.
+
+    Ключ строится по SQL запроса, поэтому разные выборки не пересекаются,
+    а сигналы сбрасывают значения вместе с версией кеша.
+    """
+
+    @cached_property
+    def count(self):
+        query_hash = md5(str(self.object_list.query).encode()).hexdigest()
+        cache_key = make_posts_cache_key('count', query_hash)
+        count = cache.get(cache_key)
+        if count is None:
+            count = super().count
+            cache.set(cache_key, count, POSTS_CACHE_TIMEOUT)
+        return count
+
+
+class KeysetPage:
+    """Страница ленты с курсорами на соседние страницы."""
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """Постраничный вывод по ключу (field, pk) без OFFSET и COUNT(*).
+
+    Страница выбирается условием на ключ последней (или первой) записи
+    соседней страницы, поэтому её стоимость не зависит от глубины ленты.
+    """
+
+    def __init__(self, queryset, per_page, field='pub_date'):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.field = field
+
+    def encode_cursor(self, direction, obj):
+        value = getattr(obj, self.field).isoformat()
+        raw = f'{direction}|{value}|{obj.pk}'
+        return urlsafe_b64encode(raw.encode()).decode()
+
+    def decode_cursor(self, cursor):
+        try:
+            direction, value, pk = (
+                urlsafe_b64decode(cursor.encode()).decode().split('|')
+            )
+            value = datetime.fromisoformat(value)
+            if value.tzinfo is None:
+                raise ValueError('Cursor datetime must be timezone-aware.')
+            position = (value.astimezone(timezone.utc), int(pk))
+        except (
+            AttributeError,
+            binascii.Error,
+            OverflowError,
+            UnicodeError,
+            ValueError
+        ):
+            return None, None
+        if direction not in (NEXT, PREVIOUS):
+            return None, None
+        return direction, position
+
+    def get_page(self, cursor=None):
+        direction, position = self.decode_cursor(cursor)
+        if direction == PREVIOUS:
+            page = self._get_previous_page(position)
+            if page.object_list:
+                return page
+        elif direction == NEXT:
+            return self._get_next_page(position)
+        return self._get_next_page()
+
+    def _get_next_page(self, position=None):
+        queryset = self.queryset.order_by(f'-{self.field}', '-pk')
+        if position is not None:
+            value, pk = position
+            queryset = queryset.filter(
+                Q(**{f'{self.field}__lt': value})
+                | Q(**{self.field: value, 'pk__lt': pk})
+            )
+        rows = list(queryset[:self.per_page + 1])
+        object_list = rows[:self.per_page]
+        return KeysetPage(
+            object_list,
+            next_cursor=(
+                self.encode_cursor(NEXT, object_list[-1])
+                if len(rows) > self.per_page else None
+            ),
+            previous_cursor=(
+                self.encode_cursor(PREVIOUS, object_list[0])
+                if position is not None and object_list else None
+            ),
+        )
+
+    def _get_previous_page(self, position):
+        value, pk = position
+        queryset = self.queryset.order_by(self.field, 'pk').filter(
+            Q(**{f'{self.field}__gt': value})
+            | Q(**{self.field: value, 'pk__gt': pk})
+        )
+        rows = list(queryset[:self.per_page + 1])
+        object_list = rows[:self.per_page][::-1]
+        return KeysetPage(
+            object_list,
+            next_cursor=(
+                self.encode_cursor(NEXT, object_list[-1])
+                if object_list else None
+            ),
+            previous_cursor=(
+                self.encode_cursor(PREVIOUS, object_list[0])
+                if len(rows) > self.per_page else None
+            ),
+        )
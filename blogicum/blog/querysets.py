@@ -1,21 +1,65 @@
-from django.db.models import Count, QuerySet
-from django.utils.timezone import localdate
+from django.db.models import Count, Exists, OuterRef, QuerySet, Subquery
+from django.db.models.functions import Coalesce, Substr
+from django.utils.timezone import now
+
+POST_PREVIEW_LENGTH: int = 300
 
 
 class PostQuerySet(QuerySet):
-    def with_related_data(self):
+    def with_related_data_join(self):
         return self.select_related('location', 'author', 'category')
 
+    def with_related_list_fields(self):
+        return self.with_related_data_join().list_fields(
+            'location__name',
+            'location__is_published',
+            'author__username',
+            'category__title',
+            'category__slug',
+            'category__is_published'
+        )
+
+    def list_fields(self, *related_fields):
+        return self.only(
+            'title',
+            'pub_date',
+            'image',
+            'is_published',
+            'author_id',
+            'location_id',
+            'category_id',
+            *related_fields
+        ).annotate(text_preview=Substr('text', 1, POST_PREVIEW_LENGTH))
+
     def published(self):
+        from .models import Category
+        return self.published_for_known_category().filter(Exists(
+            Category.objects.filter(
+                pk=OuterRef('category_id'),
+                is_published=True
+            )
+        ))
+
+    def published_for_known_category(self):
         return self.filter(
             is_published=True,
-            category__is_published=True,
-            pub_date__lt=localdate()
+            pub_date__lt=now()
         )
 
     def with_comment_count(self):
+        # Коррелированный подзапрос вместо JOIN + GROUP BY: count() у
+        # пагинатора отбрасывает неиспользуемую аннотацию и не группирует.
+        from .models import Comment
+        comment_count = (
+            Comment.objects
+            .filter(post=OuterRef('pk'))
+            .order_by()
+            .values('post')
+            .annotate(count=Count('pk'))
+            .values('count')
+        )
         return (
             self
-            .annotate(comment_count=Count('comments'))
+            .annotate(comment_count=Coalesce(Subquery(comment_count), 0))
             .order_by('-pub_date', 'title')
         )
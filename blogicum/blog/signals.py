@@ -0,0 +1,27 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_posts_cache
+from .models import Category, Comment, Location, Post
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=User)
+def reset_posts_cache(**kwargs):
+    invalidate_posts_cache()
+
+
+@receiver(post_save, sender=User)
+def reset_posts_cache_for_user(update_fields=None, **kwargs):
+    # Вход пользователя сохраняет только last_login, его на страницах нет.
+    if update_fields != frozenset({'last_login'}):
+        invalidate_posts_cache()
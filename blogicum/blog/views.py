@@ -1,32 +1,76 @@
+from functools import lru_cache
+
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.core.paginator import Paginator
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
 from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect, render
-from django.urls import reverse
+from django.template.response import TemplateResponse
+from django.urls import get_script_prefix, reverse
+from django.views.decorators.http import condition
 from django.views.generic import CreateView, DetailView, UpdateView
 
+from .cache import (
+    POSTS_CACHE_TIMEOUT,
+    cache_page_for_anonymous,
+    invalidate_posts_cache,
+    make_posts_cache_key,
+    posts_etag
+)
 from .forms import CommentForm, PostForm
 from .models import Category, Comment, Post
+from .paginators import CachedCountPaginator, KeysetPaginator
 
 MAX_POSTS: int = 10
+MAX_COMMENTS: int = 50
 User = get_user_model()
 
 
+@lru_cache(maxsize=1024)
+def _reverse_profile_url(script_prefix, username):
+    return reverse('blog:profile', kwargs={'username': username})
+
+
+def get_profile_url(username):
+    return _reverse_profile_url(get_script_prefix(), username)
+
+
 def get_paginator_page(posts, request, max_posts=MAX_POSTS):
-    paginator = Paginator(posts, max_posts)
-    return paginator.get_page(request.GET.get('page'))
+    paginator = CachedCountPaginator(posts, max_posts)
+    page_number = request.GET.get('page')
+    if page_number == 'last':
+        page_number = paginator.num_pages
+    return paginator.get_page(page_number)
+
+
+def get_keyset_page(posts, request, max_posts=MAX_POSTS):
+    paginator = KeysetPaginator(posts, max_posts)
+    return paginator.get_page(request.GET.get('cursor'))
 
 
+def get_cached_keyset_page(cache_key, posts, request, max_posts=MAX_POSTS):
+    return cache.get_or_set(
+        cache_key,
+        lambda: get_keyset_page(posts, request, max_posts),
+        POSTS_CACHE_TIMEOUT
+    )
+
+
+@condition(etag_func=posts_etag)
+@cache_page_for_anonymous
 def index(request):
     template = 'blog/index.html'
-    page_obj = get_paginator_page(
-        posts=Post.published.all().with_comment_count(),
+    page_obj = get_cached_keyset_page(
+        cache_key=make_posts_cache_key('index', request.GET.get('cursor')),
+        posts=Post.published.all(),
         request=request)
-    return render(request, template, {'page_obj': page_obj})
+    return TemplateResponse(request, template, {'page_obj': page_obj})
 
 
+@condition(etag_func=posts_etag)
+@cache_page_for_anonymous
 def category_posts(request, category_slug):
     template = 'blog/category.html'
     category = get_object_or_404(
@@ -34,11 +78,11 @@ def category_posts(request, category_slug):
         is_published=True,
         slug=category_slug
     )
-    page_obj = get_paginator_page(
-        posts=category.posts(manager='published').all(),
+    page_obj = get_keyset_page(
+        posts=Post.published_for_category(category),
         request=request
     )
-    return render(
+    return TemplateResponse(
         request,
         template,
         {
@@ -48,18 +92,37 @@ def category_posts(request, category_slug):
     )
 
 
+@condition(etag_func=posts_etag)
 def profile_view(request, username):
-    user = get_object_or_404(User, username=username)
-    if request.user == user:
-        posts = user.posts.with_comment_count()
+    is_owner = (
+        request.user.is_authenticated and request.user.username == username
+    )
+    if is_owner:
+        user = request.user
     else:
-        posts = user.posts(manager='published').all().with_comment_count()
-    page_obj = get_paginator_page(posts=posts, request=request)
+        user = get_object_or_404(
+            User.objects.only(
+                'username',
+                'first_name',
+                'last_name',
+                'date_joined',
+                'is_staff'
+            ),
+            username=username
+        )
+    posts = (
+        user.posts
+        .with_related_list_fields()
+        .with_comment_count()
+    )
+    if not is_owner:
+        posts = posts.published()
+    page_obj = get_keyset_page(posts=posts, request=request)
     context = {
         'profile': user,
         'page_obj': page_obj,
     }
-    return render(request, 'blog/profile.html', context)
+    return TemplateResponse(request, 'blog/profile.html', context)
 
 
 class ProfileEditView(LoginRequiredMixin, UpdateView):
@@ -67,13 +130,14 @@ class ProfileEditView(LoginRequiredMixin, UpdateView):
     fields = ('first_name', 'last_name', 'username', 'email')
     template_name = 'blog/user.html'
 
+    def get_queryset(self):
+        return User.objects.filter(pk=self.request.user.pk)
+
     def get_object(self):
         return self.request.user
 
     def get_success_url(self):
-        return reverse(
-            'blog:profile', kwargs={'username': self.request.user.username}
-        )
+        return get_profile_url(self.request.user.username)
 
 
 class PostMixin:
@@ -83,20 +147,24 @@ class PostMixin:
 
 
 class OnlyAuthorMixin(UserPassesTestMixin):
+    _object = None
+
+    def get_object(self, queryset=None):
+        if self._object is None:
+            self._object = super().get_object(queryset)
+        return self._object
+
     def test_func(self):
-        obj = self.get_object()
-        return obj.author == self.request.user
+        return self.get_object().author_id == self.request.user.pk
 
 
 class PostCreateView(LoginRequiredMixin, PostMixin, CreateView):
     def form_valid(self, form):
-        form.instance.author = self.request.user
+        form.instance.author_id = self.request.user.pk
         return super().form_valid(form)
 
     def get_success_url(self):
-        return reverse(
-            'blog:profile',
-            kwargs={'username': self.request.user.username})
+        return get_profile_url(self.request.user.username)
 
 
 class PostDetailView(DetailView):
@@ -104,6 +172,21 @@ class PostDetailView(DetailView):
     template_name = 'blog/detail.html'
     pk_url_kwarg = 'post_id'
 
+    def get_queryset(self):
+        return Post.objects.with_related_data_join().only(
+            'title',
+            'text',
+            'pub_date',
+            'image',
+            'is_published',
+            'author__username',
+            'category__title',
+            'category__slug',
+            'category__is_published',
+            'location__name',
+            'location__is_published'
+        )
+
     def get_object(self, queryset=None):
         object = super().get_object()
         if self.request.user == object.author or (
@@ -114,7 +197,13 @@ class PostDetailView(DetailView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['form'] = CommentForm()
-        context['comments'] = self.object.comments.select_related('author')
+        context['comments'] = get_paginator_page(
+            self.object.comments
+            .select_related('author')
+            .only('text', 'created_at', 'post_id', 'author__username'),
+            self.request,
+            MAX_COMMENTS
+        )
         return context
 
 
@@ -143,10 +232,14 @@ class PostEditView(
 
 @login_required
 def delete_post(request, post_id):
-    instance = get_object_or_404(Post, pk=post_id, author=request.user)
+    instance = get_object_or_404(
+        Post.objects.select_related('location'),
+        pk=post_id,
+        author_id=request.user.pk
+    )
     if request.method == 'POST':
         instance.delete()
-        return redirect('blog:profile', request.user)
+        return redirect(get_profile_url(request.user.username))
     return render(
         request,
         'blog/create.html',
@@ -161,14 +254,19 @@ class CommentMixin:
 
 class CommentCreateView(LoginRequiredMixin, CommentMixin, CreateView):
     def form_valid(self, form):
-        comment = form.save(commit=False)
-        comment.post = get_object_or_404(Post, id=self.kwargs.get('post_id'))
-        comment.author = self.request.user
-        comment.save()
-        return super().form_valid(form)
+        form.instance.post_id = self.kwargs['post_id']
+        form.instance.author_id = self.request.user.pk
+        try:
+            with transaction.atomic():
+                return super().form_valid(form)
+        except IntegrityError:
+            raise Http404()
 
     def get_success_url(self):
-        return reverse('blog:post_detail', args=(self.kwargs['post_id'],))
+        # Комментарии идут от старых к новым: новый всегда на последней
+        # странице.
+        url = reverse('blog:post_detail', args=(self.kwargs['post_id'],))
+        return f'{url}?page=last#comment_{self.object.pk}'
 
 
 class CommentEditView(
@@ -195,9 +293,14 @@ class CommentEditView(
 
 @login_required
 def delete_comment(request, post_id, comment_id):
-    instance = get_object_or_404(Comment, id=comment_id, author=request.user)
+    instance = get_object_or_404(
+        Comment,
+        id=comment_id,
+        author_id=request.user.pk
+    )
     if request.method == 'POST':
         instance.delete()
+        invalidate_posts_cache()
         return redirect('blog:post_detail', post_id)
     return render(
         request,
@@ -15,7 +15,10 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('blog.urls', namespace='blog')),
     path('pages/', include('pages.urls', namespace='pages')),
-    path('auth/logout/', views.blogicum_logout, name='logout'),
+    path(
+        'auth/logout/',
+        views.BlogicumLogoutView.as_view(),
+        name='logout'),
     path('auth/', include('django.contrib.auth.urls')),
     path(
         'auth/registration/',
@@ -1,7 +1,9 @@
-from django.contrib.auth import logout as auth_logout
-from django.shortcuts import render
+from django.contrib.auth.views import LogoutView
 
 
-def blogicum_logout(request):
-    auth_logout(request)
-    return render(request, 'registration/logged_out.html')
+class BlogicumLogoutView(LogoutView):
+    http_method_names = ['get', 'post', 'options']
+    template_name = 'registration/logged_out.html'
+
+    def get(self, request, *args, **kwargs):
+        return self.post(request, *args, **kwargs)
@@ -0,0 +1,209 @@
+from base64 import urlsafe_b64encode
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.cache import get_posts_cache_version
+from blog.models import Comment
+from blog.views import MAX_COMMENTS
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(settings):
+    # Запросы к таблице кеша не относятся к данным страниц и не считаются.
+    settings.CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def many_posts(mixer, user):
+    pub_date = timezone.now() - timedelta(days=1)
+    posts = mixer.cycle(N_PER_PAGE * 2).blend(
+        'blog.Post',
+        is_published=True,
+        pub_date=pub_date,
+        category__is_published=True,
+        location__is_published=True,
+    )
+    posts += mixer.cycle(N_PER_PAGE * 2).blend(
+        'blog.Post',
+        author=user,
+        is_published=True,
+        pub_date=pub_date,
+        category=posts[0].category,
+        location__is_published=True,
+    )
+    for post in posts[:3]:
+        mixer.cycle(N_PER_PAGE).blend('blog.Comment', post=post)
+    return posts
+
+
+def test_index_queries(client, many_posts, django_assert_num_queries):
+    # Страница постов вместе с местоположениями, авторами и категориями.
+    with django_assert_num_queries(1):
+        response = client.get('/')
+    assert len(response.context['page_obj']) == N_PER_PAGE
+
+
+def test_category_queries(client, many_posts, django_assert_num_queries):
+    url = f'/category/{many_posts[0].category.slug}/'
+    # Категория и страница постов с авторами и местоположениями.
+    with django_assert_num_queries(2):
+        response = client.get(url)
+    assert len(response.context['page_obj']) == N_PER_PAGE
+
+
+def test_profile_queries(
+        client, user_client, user, many_posts, django_assert_num_queries
+):
+    url = f'/profile/{user.username}/'
+    # Пользователь и страница постов со связанными объектами.
+    with django_assert_num_queries(2):
+        response = client.get(url)
+    assert len(response.context['page_obj']) == N_PER_PAGE
+    # Для автора пользователь берётся из сессии.
+    with django_assert_num_queries(3):
+        response = user_client.get(url)
+    assert len(response.context['page_obj']) == N_PER_PAGE
+
+
+def test_keyset_pagination(client, many_posts):
+    seen = []
+    pages = []
+    url = '/'
+    while url:
+        page_obj = client.get(url).context['page_obj']
+        pages.append([post.id for post in page_obj])
+        seen += pages[-1]
+        url = page_obj.has_next() and f'/?cursor={page_obj.next_cursor}'
+    assert sorted(seen) == sorted(post.id for post in many_posts)
+    assert len(seen) == len(set(seen))
+
+    page_obj = client.get(f'/?cursor={page_obj.previous_cursor}').context[
+        'page_obj'
+    ]
+    assert [post.id for post in page_obj] == pages[-2]
+
+
+def test_post_detail_queries(client, many_posts, django_assert_num_queries):
+    # Пост со связанными объектами, COUNT и страница комментариев.
+    with django_assert_num_queries(3):
+        response = client.get(f'/posts/{many_posts[0].id}/')
+    assert len(response.context['comments']) == N_PER_PAGE
+
+
+def test_index_cache_reset_on_author_rename(client, user, many_posts):
+    assert f'/profile/{user.username}/' in client.get('/').content.decode()
+    old_username = user.username
+    user.username = f'{old_username}_renamed'
+    user.save()
+    content = client.get('/').content.decode()
+    assert f'/profile/{old_username}/' not in content
+    assert f'/profile/{user.username}/' in content
+
+
+def test_profile_etag(user_client, user, many_posts):
+    url = f'/profile/{user.username}/'
+    etag = user_client.get(url)['ETag']
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    response = user_client.post('/auth/edit_profile/', {
+        'first_name': 'Новое имя',
+        'last_name': user.last_name,
+        'username': user.username,
+        'email': user.email,
+    })
+    assert response.status_code == HTTPStatus.FOUND
+    response = user_client.get(response.url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert 'Новое имя' in response.content.decode()
+
+
+def test_anonymous_page_cache(
+        client, user_client, user, mixer, many_posts,
+        django_assert_num_queries
+):
+    client.get('/')
+    # Повторный запрос гостя отдаётся из кеша целиком.
+    with django_assert_num_queries(0):
+        cached_content = client.get('/').content
+    # Авторизованный пользователь получает свою, некешированную страницу.
+    with CaptureQueriesContext(connection) as context:
+        content = user_client.get('/').content.decode()
+    assert context.captured_queries
+    assert user.username in content.split('</header>')[0]
+    assert cached_content == client.get('/').content
+
+    mixer.blend('blog.Comment', post=many_posts[-1], author=user)
+    with CaptureQueriesContext(connection) as context:
+        client.get('/')
+    assert context.captured_queries
+
+    client.get('/')
+    post = many_posts[-1]
+    post.title = 'Новый заголовок'
+    post.save()
+    assert 'Новый заголовок' in client.get('/').content.decode()
+
+
+def test_new_comment_redirects_to_last_page(user_client, mixer, many_posts):
+    post = many_posts[0]
+    mixer.cycle(MAX_COMMENTS).blend('blog.Comment', post=post)
+    response = user_client.post(
+        f'/posts/{post.id}/comment', {'text': 'Новый комментарий'}
+    )
+    comment = post.comments.latest('created_at')
+    assert response.url == (
+        f'/posts/{post.id}/?page=last#comment_{comment.id}'
+    )
+    response = user_client.get(response.url)
+    assert comment in response.context['comments']
+
+
+def test_delete_post_with_comments_queries(
+        user_client, user, mixer, django_assert_num_queries
+):
+    post = mixer.blend('blog.Post', author=user)
+    mixer.cycle(MAX_COMMENTS).blend('blog.Comment', post=post)
+    # Сессия, пользователь, пост, удаление комментариев и поста.
+    with django_assert_num_queries(5):
+        user_client.post(f'/posts/{post.id}/delete/')
+    assert not Comment.objects.filter(post_id=post.id).exists()
+
+
+def test_delete_comment_resets_cache(user_client, user, mixer):
+    comment = mixer.blend('blog.Comment', author=user)
+    version = get_posts_cache_version()
+    user_client.post(
+        f'/posts/{comment.post_id}/delete_comment/{comment.id}/'
+    )
+    assert not Comment.objects.filter(pk=comment.pk).exists()
+    assert get_posts_cache_version() != version
+
+
+@pytest.mark.parametrize('raw_cursor', (
+    'next|0001-01-01T00:00:00+14:00|1',
+    'prev|9999-12-31T23:59:59-14:00|1',
+    'next|2020-01-01T00:00:00|1',
+))
+def test_bad_cursor_falls_back_to_first_page(client, many_posts, raw_cursor):
+    cursor = urlsafe_b64encode(raw_cursor.encode()).decode()
+    first_page = [post.id for post in client.get('/').context['page_obj']]
+    response = client.get(f'/?cursor={cursor}')
+    assert response.status_code == HTTPStatus.OK
+    assert [post.id for post in response.context['page_obj']] == first_page